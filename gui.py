@@ -78,21 +78,33 @@ class MainWindow(QMainWindow):
         self.btn_save_bak.clicked.connect(self.on_save_as_bak)
         self.btn_restore_from_bak.clicked.connect(self.on_restore_now)
 
-        self.current_widgets = []
+        # (block, editor refs) for the Host shown in the form; only one is ever live
+        self._current_edit = None
 
     def reload_host_list(self):
-        self.list_widget.clear()
-        for i, block in enumerate(self.ssh.blocks):
-            name = block.header.raw
-            item = HostListItem(name, i)
-            self.list_widget.addItem(item)
+        self.list_widget.setUpdatesEnabled(False)
+        self.list_widget.blockSignals(True)
+        try:
+            self.list_widget.clear()
+            for i, block in enumerate(self.ssh.blocks):
+                name = block.header.raw
+                item = HostListItem(name, i)
+                self.list_widget.addItem(item)
+        finally:
+            self.list_widget.blockSignals(False)
+            self.list_widget.setUpdatesEnabled(True)
+            self.list_widget.viewport().update()
 
     def clear_form(self):
-        for w in self.current_widgets:
-            w.setParent(None)
-        self.current_widgets = []
-        while self.form_layout.rowCount() > 0:
-            self.form_layout.removeRow(0)
+        # The editors are destroyed below, so keep what was typed into them first
+        if self._current_edit is not None:
+            self._commit_edit()
+            self._current_edit = None
+        old = self.form_area.takeWidget()
+        self.form_widget = QWidget()
+        self.form_layout = QFormLayout(self.form_widget)
+        self.form_area.setWidget(self.form_widget)
+        old.deleteLater()
 
     def on_select_host(self, current, previous=None):
         if current is None:
@@ -103,63 +115,58 @@ class MainWindow(QMainWindow):
         header_lbl = QLabel('Host (pattern)')
         header_edit = QLineEdit(block.header.raw.replace('\n',''))
         self.form_layout.addRow(header_lbl, header_edit)
-        self.current_widgets.extend([header_lbl, header_edit])
 
+        refs = []
         for opt in block.options:
             row_label = QLabel(opt.key if opt.key else '<comment>')
             expl = self.expl.get(opt.key, '')
             if expl:
                 row_label.setToolTip(expl)
-            val_edit = QLineEdit(opt.value if opt.value is not None else '')
-            comment_chk = QCheckBox('Commented')
-            comment_chk.setChecked(opt.commented)
-            self.form_layout.addRow(row_label, val_edit)
-            self.form_layout.addRow(QLabel(''), comment_chk)
-            self.current_widgets.extend([row_label, val_edit, comment_chk])
+            row_widget, val_edit, comment_chk = self._option_editor(opt)
+            self.form_layout.addRow(row_label, row_widget)
+            refs.append((row_label, val_edit, comment_chk))
 
         add_opt_btn = QPushButton('Add Option')
         add_opt_btn.clicked.connect(lambda _, i=idx: self.add_option(i))
         self.form_layout.addRow(add_opt_btn)
-        self.current_widgets.append(add_opt_btn)
 
-        block._editor_refs = {
+        self._current_edit = (block, {
             'header': header_edit,
-            'option_rows': []
-        }
-        row = 1
-        idx_widget = 0
-        for opt in block.options:
-            pass
-        refs = []
-        cw = self.current_widgets[2:]  
-        i = 0
-        while i < len(cw):
-            lbl = cw[i]
-            if isinstance(lbl, QLabel) and lbl.text() == '':
-                i += 1
-                continue
-            if i+1 < len(cw):
-                val = cw[i+1]
-            else:
-                val = None
-            chk = cw[i+2] if (i+2 < len(cw) and isinstance(cw[i+2], QCheckBox)) else None
-            refs.append((lbl, val, chk))
-            i += 3
-        block._editor_refs['option_rows'] = refs
+            'option_rows': refs
+        })
 
     def add_option(self, block_index):
         block = self.ssh.blocks[block_index]
         opt = ConfigOption(key='NewOption', value='', raw='NewOption ', commented=False)
         block.options.append(opt)
-        self.reload_host_list()
-        self.list_widget.setCurrentRow(block_index)
+
+        # The button lives in the selected Host's form, so append the new row
+        # above it instead of rebuilding the sidebar and the whole form.
+        row_label = QLabel(opt.key)
+        row_widget, val_edit, comment_chk = self._option_editor(opt)
+        self.form_layout.insertRow(self.form_layout.rowCount() - 1, row_label, row_widget)
+        self._current_edit[1]['option_rows'].append((row_label, val_edit, comment_chk))
+
+    def _option_editor(self, opt):
+        """Value field and Commented checkbox packed into a single form row widget."""
+        val_edit = QLineEdit(opt.value if opt.value is not None else '')
+        comment_chk = QCheckBox('Commented')
+        comment_chk.setChecked(opt.commented)
+        row_widget = QWidget()
+        row = QHBoxLayout(row_widget)
+        row.setContentsMargins(0, 0, 0, 0)
+        row.addWidget(val_edit, 1)
+        row.addWidget(comment_chk)
+        return row_widget, val_edit, comment_chk
 
     def on_add_host(self):
         from PyQt6.QtWidgets import QInputDialog
         text, ok = QInputDialog.getText(self, 'Add Host', 'Enter host pattern:')
         if ok and text.strip():
             self.ssh.add_host(text.strip())
-            self.reload_host_list()
+            # add_host appends a block, so only the new sidebar entry is needed
+            index = len(self.ssh.blocks) - 1
+            self.list_widget.addItem(HostListItem(self.ssh.blocks[index].header.raw, index))
 
     def on_backup(self):
         try:
@@ -200,18 +207,22 @@ class MainWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, 'Error', str(e))
 
+    def _commit_edit(self):
+        block, refs = self._current_edit
+        hdr = refs['header'].text().strip()
+        block.header.raw = hdr
+        for (lbl, val_widget, chk), opt in zip(refs['option_rows'], block.options):
+            key = lbl.text()
+            value = val_widget.text() if val_widget else ''
+            commented = chk.isChecked() if chk else False
+            if opt.key != key or opt.value != value or opt.commented != commented:
+                opt.key = key
+                opt.value = value
+                opt.commented = commented
+                opt.raw = f'{key} {value}'.strip()
+
     def collect_and_serialize(self) -> str:
-        for i, block in enumerate(self.ssh.blocks):
-            if not hasattr(block, '_editor_refs'):
-                continue
-            hdr = block._editor_refs['header'].text().strip()
-            block.header.raw = hdr
-            new_opts = []
-            for (lbl, val_widget, chk) in block._editor_refs['option_rows']:
-                key = lbl.text()
-                value = val_widget.text() if val_widget else ''
-                commented = chk.isChecked() if chk else False
-                raw = f'{key} {value}'.strip()
-                new_opts.append(ConfigOption(key=key, value=value, raw=raw, commented=commented))
-            block.options = new_opts
-        return self.ssh.to_text()
\ No newline at end of file
+        # Only the displayed block has live editors; others were committed in clear_form
+        if self._current_edit is not None:
+            self._commit_edit()
+        return self.ssh.to_text()
@@ -1,15 +1,16 @@
-
 """
 Entry point. Requires root, launches SSH server config GUI.
 """
 import sys
 import utils
-from PyQt6.QtWidgets import QApplication
-from sshd_gui import SSHDMainWindow
 
 def main():
     utils.require_root_or_exit()
     
+    # Imported after the root check so a non-root run exits without loading PyQt
+    from PyQt6.QtWidgets import QApplication
+    from sshd_gui import SSHDMainWindow
+    
     config_path = '/etc/ssh/sshd_config'
     
     app = QApplication(sys.argv)
@@ -18,4 +19,4 @@ def main():
     sys.exit(app.exec())
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -1,24 +1,113 @@
 """
 PyQt6 GUI implementation for SSH server configuration (sshd_config) editor.
 """
-import sys
-from PyQt6.QtWidgets import (QWidget, QMainWindow, QListWidget, QVBoxLayout,
+import os
+import functools
+from PyQt6.QtWidgets import (QWidget, QMainWindow, QListView, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QLineEdit, QMessageBox,
-                             QListWidgetItem, QFormLayout, QCheckBox, QScrollArea, QTextEdit,
-                             QInputDialog)
-from PyQt6.QtCore import Qt
+                             QFormLayout, QCheckBox, QScrollArea, QTextEdit,
+                             QDialog, QDialogButtonBox)
+from PyQt6.QtCore import (Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex,
+                          QObject, QRunnable, QThreadPool, QTimer, QCoreApplication,
+                          pyqtSignal)
 from sshd_parser import SSHDConfig, SSHDOption
 import json
 import utils
 
-class SSHDOptionItem(QListWidgetItem):
-    def __init__(self, option: SSHDOption, index: int):
-        title = f"{option.key}: {option.value}" if option.key and option.value else option.key or "<comment>"
-        if option.commented:
-            title = f"# {title}"
-        super().__init__(title)
-        self.option = option
-        self.index = index
+DEFAULT_EXPLANATIONS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                         'default_sshd_explanations.json')
+
+@functools.lru_cache(maxsize=None)
+def default_explanations():
+    """Built-in option descriptions, parsed once per process and shared read-only."""
+    try:
+        with open(DEFAULT_EXPLANATIONS_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+class SSHDOptionModel(QAbstractListModel):
+    """List model backed directly by SSHDConfig.all_lines (row == line index)."""
+
+    def __init__(self, sshd: SSHDConfig, parent=None):
+        super().__init__(parent)
+        self.sshd = sshd
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or not self.sshd.loaded:
+            return 0
+        return len(self.sshd.all_lines)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        option: SSHDOption = self.sshd.all_lines[index.row()]
+        return option.display
+
+    def reload(self):
+        self.beginResetModel()
+        self.endResetModel()
+
+    def add_option(self, key: str, value: str) -> SSHDOption:
+        row = len(self.sshd.all_lines)
+        self.beginInsertRows(QModelIndex(), row, row)
+        option = self.sshd.add_option(key, value)
+        self.endInsertRows()
+        return option
+
+    def refresh_row(self, row):
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or count < 1 or row + count > len(self.sshd.all_lines):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        self.sshd.remove_option(row, count)
+        self.endRemoveRows()
+        return True
+
+class LoadSignals(QObject):
+    loaded = pyqtSignal()
+    failed = pyqtSignal(str)
+
+class LoadTask(QRunnable):
+    """Loads the config and ensures its backup exists, off the UI thread."""
+
+    def __init__(self, sshd: SSHDConfig):
+        super().__init__()
+        self.sshd = sshd
+        self.signals = LoadSignals()
+
+    def run(self):
+        try:
+            self.sshd.load()
+            self.sshd.ensure_backup_exists()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.loaded.emit()
+
+class SaveSignals(QObject):
+    finished = pyqtSignal(str)
+    error = pyqtSignal(str)
+
+class SaveTask(QRunnable):
+    """Writes already-serialized config text through SSHDConfig.save, off the UI thread."""
+
+    def __init__(self, sshd: SSHDConfig, text: str):
+        super().__init__()
+        self.sshd = sshd
+        self.text = text
+        self.signals = SaveSignals()
+
+    def run(self):
+        try:
+            bak = self.sshd.save(self.text)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        self.signals.finished.emit(bak)
 
 class SSHDMainWindow(QMainWindow):
     def __init__(self, config_path=None):
@@ -27,124 +116,46 @@ class SSHDMainWindow(QMainWindow):
         self.resize(1200, 700)
         self.config_path = config_path
         self.sshd = SSHDConfig(path=config_path)
-        
-        try:
-            self.sshd.load()
-        except Exception as e:
-            QMessageBox.critical(self, 'Error', f'Failed to load SSH server config: {str(e)}')
-            sys.exit(1)
-        
-        utils.ensure_backup_exists(self.sshd.path)
+        self.expl = None
+
+        self.setup_ui()
 
+        # Parse the config in the background so the window paints immediately
+        self.set_controls_enabled(False)
+        self.statusBar().showMessage('Loading configuration...')
+        self._load_task = LoadTask(self.sshd)
+        self._load_task.signals.loaded.connect(self.on_loaded)
+        self._load_task.signals.failed.connect(self.on_load_failed)
+        QThreadPool.globalInstance().start(self._load_task)
+
+    def on_loaded(self):
+        self._load_task = None
+        self.statusBar().clearMessage()
+        self.reload_options_list()
+        self.set_controls_enabled(True)
+
+    def on_load_failed(self, error):
+        self._load_task = None
+        QMessageBox.critical(self, 'Error', f'Failed to load SSH server config: {error}')
+        QCoreApplication.exit(1)
+
+    def set_controls_enabled(self, enabled):
+        for w in (self.search_bar, self.list_widget, self.form_widget, self.btn_backup,
+                  self.btn_restore, self.btn_add, self.btn_save, self.btn_save_bak):
+            w.setEnabled(enabled)
+
+    def _get_expl(self, key):
+        """Return the description for an option, loading explanations on first use."""
+        if self.expl is None:
+            self._load_explanations()
+        return self.expl.get(key, '')
+
+    def _load_explanations(self):
         try:
             with open('sshd_explanations.json', 'r', encoding='utf-8') as f:
                 self.expl = json.load(f)
         except Exception:
-            self.expl = {
-                # Connection Settings
-                'Port': 'Port number that sshd listens on. Default is 22. Can specify multiple ports.',
-                'ListenAddress': 'IP address(es) that sshd should listen on. Use 0.0.0.0 for all IPv4, :: for all IPv6.',
-                'AddressFamily': 'Restricts protocol versions. Values: any (default), inet (IPv4 only), inet6 (IPv6 only).',
-                'Protocol': 'SSH protocol versions to support. Use "2" for SSH-2 only (recommended).',
-                'TCPKeepAlive': 'Send TCP keepalive messages to detect dead connections. Values: yes, no.',
-                'ClientAliveInterval': 'Timeout in seconds after which server sends keepalive message. 0 disables.',
-                'ClientAliveCountMax': 'Number of keepalive messages before disconnecting unresponsive client.',
-                'MaxStartups': 'Maximum number of concurrent unauthenticated connections. Format: start:rate:full.',
-                'MaxSessions': 'Maximum number of open sessions permitted per network connection.',
-                'MaxAuthTries': 'Maximum number of authentication attempts per connection. Default is 6.',
-                
-                # Host Keys
-                'HostKey': 'Private key files used by sshd for host authentication. Specify one per key type.',
-                'HostKeyAlgorithms': 'Comma-separated list of host key algorithms that the server offers.',
-                'PubkeyAcceptedKeyTypes': 'Comma-separated list of public key types accepted for public key authentication.',
-                'HostCertificate': 'File containing host certificate used for host authentication.',
-                'TrustedUserCAKeys': 'File containing certificate authorities trusted to sign user certificates.',
-                
-                # Authentication
-                'PermitRootLogin': 'Whether root can log in. Values: yes, no, prohibit-password, forced-commands-only.',
-                'PasswordAuthentication': 'Whether password authentication is allowed. Disable for key-only auth.',
-                'PubkeyAuthentication': 'Whether public key authentication is allowed. Should be enabled.',
-                'AuthorizedKeysFile': 'File(s) containing public keys for authentication. Default: .ssh/authorized_keys.',
-                'AuthorizedKeysCommand': 'Command to retrieve authorized keys. Use with AuthorizedKeysCommandUser.',
-                'AuthorizedKeysCommandUser': 'User to run AuthorizedKeysCommand as. Must not be root.',
-                'PermitEmptyPasswords': 'Allow login to accounts with empty passwords. Highly discouraged.',
-                'ChallengeResponseAuthentication': 'Enable challenge-response authentication (keyboard-interactive).',
-                'KerberosAuthentication': 'Enable Kerberos authentication. Requires proper Kerberos setup.',
-                'GSSAPIAuthentication': 'Enable GSSAPI authentication. Used with Kerberos/Active Directory.',
-                'UsePAM': 'Enable Pluggable Authentication Modules. Required for many auth methods.',
-                'AuthenticationMethods': 'Required authentication methods. Use for multi-factor auth.',
-                'RequiredRSASize': 'Minimum RSA key size in bits. Default varies by SSH version.',
-                
-                # Access Control
-                'AllowUsers': 'Space-separated list of users allowed to log in. Supports wildcards and patterns.',
-                'DenyUsers': 'Space-separated list of users denied login. Takes precedence over AllowUsers.',
-                'AllowGroups': 'Space-separated list of groups allowed to log in. Members can connect.',
-                'DenyGroups': 'Space-separated list of groups denied login. Takes precedence over AllowGroups.',
-                'LoginGraceTime': 'Time in seconds for user to authenticate. Connection closed if exceeded.',
-                'StrictModes': 'Check file permissions and ownership of user files and home directory.',
-                'PermitUserEnvironment': 'Allow ~/.ssh/environment and environment= in authorized_keys.',
-                
-                # Forwarding and Tunneling
-                'X11Forwarding': 'Allow X11 forwarding. Required for GUI applications over SSH.',
-                'X11DisplayOffset': 'First display number available for X11 forwarding. Default is 10.',
-                'X11UseLocalhost': 'Bind X11 forwarding server to loopback address or wildcard address.',
-                'AllowTcpForwarding': 'Allow TCP port forwarding. Values: yes, no, local, remote.',
-                'GatewayPorts': 'Allow remote hosts to connect to forwarded ports. Values: yes, no, clientspecified.',
-                'PermitTunnel': 'Allow tun device forwarding. Values: yes, no, point-to-point, ethernet.',
-                'AllowStreamLocalForwarding': 'Allow Unix domain socket forwarding. Values: yes, no, local, remote.',
-                'StreamLocalBindUnlink': 'Remove existing Unix domain socket before creating new one.',
-                
-                # Security Features
-                'PubkeyAuthOptions': 'Comma-separated list of public key authentication options.',
-                'HostbasedAuthentication': 'Enable host-based authentication using .rhosts or .shosts files.',
-                'HostbasedUsesNameFromPacketOnly': 'Use hostname from SSH packet for host-based auth.',
-                'IgnoreRhosts': 'Ignore .rhosts and .shosts files. Should be enabled for security.',
-                'IgnoreUserKnownHosts': 'Ignore ~/.ssh/known_hosts for host-based authentication.',
-                'RhostsRSAAuthentication': 'Enable rhosts RSA authentication (SSH protocol 1 only).',
-                'RSAAuthentication': 'Enable RSA authentication (SSH protocol 1 only). Deprecated.',
-                'PermitTTY': 'Allow pty allocation. Required for interactive shells.',
-                'PermitOpen': 'Restrict port forwarding destinations. Use "none" to disable, "any" to allow all.',
-                'ForceCommand': 'Force execution of specified command for all users. Overrides user commands.',
-                'ChrootDirectory': 'Restrict users to specified directory. Use %h for home directory substitution.',
-                
-                # Logging and Monitoring
-                'SyslogFacility': 'Syslog facility for logging SSH messages. Default is AUTH.',
-                'LogLevel': 'Logging verbosity. Values: QUIET, FATAL, ERROR, INFO, VERBOSE, DEBUG, DEBUG1-3.',
-                'PrintMotd': 'Print /etc/motd when user logs in interactively. May duplicate PAM motd.',
-                'PrintLastLog': 'Print date and time of last login when user logs in interactively.',
-                'Banner': 'File containing message displayed before authentication. Use for legal notices.',
-                'VersionAddendum': 'String appended to SSH version. Useful for identifying custom builds.',
-                
-                # Environment and Execution
-                'AcceptEnv': 'Environment variables that may be sent by client and set on server.',
-                'PermitUserRC': 'Allow execution of ~/.ssh/rc when user logs in.',
-                'SetEnv': 'Set environment variables for authenticated sessions.',
-                'Subsystem': 'Configure external subsystem (e.g., sftp). Format: name command [args...]',
-                'Include': 'Include specified configuration file(s). Supports wildcards.',
-                'Match': 'Conditional configuration block. Apply settings based on user, group, host, etc.',
-                
-                # Cryptographic Settings
-                'Ciphers': 'Comma-separated list of symmetric ciphers allowed. Order indicates preference.',
-                'MACs': 'Comma-separated list of message authentication codes allowed.',
-                'KexAlgorithms': 'Comma-separated list of key exchange algorithms allowed.',
-                'RekeyLimit': 'Data limit and time limit for rekeying. Format: "data_limit time_limit".',
-                'FingerprintHash': 'Hash algorithm for key fingerprints. Values: md5, sha256.',
-                
-                # Advanced Options
-                'Compression': 'Enable compression after authentication. Values: yes, no, delayed.',
-                'UseDNS': 'Look up remote hostname and verify resolved IP matches connection IP.',
-                'VersionAddendum': 'String to append to SSH version identification string.',
-                'DebianBanner': 'Show Debian-specific banner. Debian/Ubuntu specific option.',
-                'UsePrivilegeSeparation': 'Use privilege separation for security. Values: yes, no, sandbox.',
-                'ShowPatchLevel': 'Show patch level in version string. OpenSSH specific.',
-                'DisableForwarding': 'Disable all forwarding features. Shortcut for multiple no settings.',
-                'ExposeAuthInfo': 'Expose authentication information via environment variables.',
-                'RDomain': 'Set routing domain for connection. BSD-specific feature.',
-                'IPQoS': 'IP Quality of Service settings for interactive and bulk traffic.'
-            }
-
-        self.setup_ui()
-        self.reload_options_list()
+            self.expl = default_explanations()
 
     def setup_ui(self):
         container = QWidget()
@@ -167,7 +178,12 @@ class SSHDMainWindow(QMainWindow):
         search_layout.addWidget(self.search_bar)
         left.addLayout(search_layout)
 
-        self.list_widget = QListWidget()
+        self.model = SSHDOptionModel(self.sshd, self)
+        self.list_widget = QListView()
+        # Every row is a single line of text, so the view can lay out rows from one
+        # size hint instead of querying each row
+        self.list_widget.setUniformItemSizes(True)
+        self.list_widget.setModel(self.model)
         left.addWidget(self.list_widget)
 
         btn_layout = QHBoxLayout()
@@ -191,6 +207,39 @@ class SSHDMainWindow(QMainWindow):
         self.form_area.setWidgetResizable(True)
         right.addWidget(self.form_area)
 
+        # Editor widgets are built once and repopulated on every selection
+        self.key_edit = QLineEdit()
+        self.form_layout.addRow(QLabel('Option:'), self.key_edit)
+
+        self.value_edit = QLineEdit()
+        self.form_layout.addRow(QLabel('Value:'), self.value_edit)
+
+        self.comment_chk = QCheckBox('Commented out (disabled)')
+        self.form_layout.addRow(QLabel(''), self.comment_chk)
+
+        self.expl_text = QTextEdit()
+        self.expl_text.setMaximumHeight(80)
+        self.expl_text.setReadOnly(True)
+        self.form_layout.addRow(QLabel('Description:'), self.expl_text)
+
+        self.delete_btn = QPushButton('Delete This Option')
+        self.delete_btn.setStyleSheet("background-color: #cc0000; color: white;")
+        self.form_layout.addRow(self.delete_btn)
+
+        # Add Option dialog, reused for every click
+        self._add_opt_dialog = QDialog(self)
+        self._add_opt_dialog.setWindowTitle('Add Option')
+        dialog_layout = QFormLayout(self._add_opt_dialog)
+        self._add_key_edit = QLineEdit()
+        self._add_value_edit = QLineEdit()
+        dialog_layout.addRow('Option name:', self._add_key_edit)
+        dialog_layout.addRow('Value (optional):', self._add_value_edit)
+        dialog_buttons = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok |
+                                          QDialogButtonBox.StandardButton.Cancel)
+        dialog_buttons.accepted.connect(self._add_opt_dialog.accept)
+        dialog_buttons.rejected.connect(self._add_opt_dialog.reject)
+        dialog_layout.addRow(dialog_buttons)
+
         save_layout = QHBoxLayout()
         self.btn_save_bak = QPushButton('Save as Backup')
         self.btn_save = QPushButton('Save & Apply')
@@ -200,99 +249,121 @@ class SSHDMainWindow(QMainWindow):
 
         layout.addLayout(right, 3)
 
-        self.list_widget.currentItemChanged.connect(self.on_select_option)
+        self.list_widget.selectionModel().currentChanged.connect(self.on_select_option)
+
+        # Coalesce bursts of selection changes (e.g. a held arrow key) into one form update
+        self._pending_index = QPersistentModelIndex()
+        self._sel_timer = QTimer(self)
+        self._sel_timer.setSingleShot(True)
+        self._sel_timer.setInterval(50)
+        self._sel_timer.timeout.connect(self._apply_selection)
         self.btn_backup.clicked.connect(self.on_backup)
         self.btn_restore.clicked.connect(self.on_restore)
         self.btn_add.clicked.connect(self.on_add_option)
         self.btn_save.clicked.connect(self.on_save)
         self.btn_save_bak.clicked.connect(self.on_save_as_bak)
+        self.delete_btn.clicked.connect(lambda: self.delete_option(self._current_row))
+        # Any change to the editors marks the form dirty; _apply_selection clears the
+        # flag again after filling them in
+        self.key_edit.textChanged.connect(self._mark_form_dirty)
+        self.value_edit.textChanged.connect(self._mark_form_dirty)
+        self.comment_chk.toggled.connect(self._mark_form_dirty)
 
         # Connect search bar to filter function
         self.search_bar.textChanged.connect(self.filter_options_list)
 
-        self.current_widgets = []
+        self._current_option = None
+        self._current_row = None
+        self._form_dirty = False
+        self.clear_form()
 
     def filter_options_list(self):
         query = self.search_bar.text().strip().lower()
-        self.list_widget.clear()
-        for i, option in enumerate(self.sshd.all_lines):
-            display_text = f"{option.key}: {option.value}" if option.key and option.value else option.key or "<comment>"
-            if option.commented:
-                display_text = f"# {display_text}"
-            if not query or (option.key and query in option.key.lower()) or (option.value and query in str(option.value).lower()) or (display_text and query in display_text.lower()):
-                item = SSHDOptionItem(option, i)
-                self.list_widget.addItem(item)
+        self.list_widget.setUpdatesEnabled(False)
+        try:
+            for i, option in enumerate(self.sshd.all_lines):
+                # The cached title already contains the key (and the value, when there is a key)
+                matches = not query or query in option.display.lower() or (option.value and query in option.value.lower())
+                self.list_widget.setRowHidden(i, not matches)
+        finally:
+            self.list_widget.setUpdatesEnabled(True)
+            self.list_widget.viewport().update()
 
     def reload_options_list(self):
-        self.list_widget.clear()
-        for i, option in enumerate(self.sshd.all_lines):
-            item = SSHDOptionItem(option, i)
-            self.list_widget.addItem(item)
+        self.model.reload()
+        if self.search_bar.text().strip():
+            self.filter_options_list()
 
     def clear_form(self):
-        for w in self.current_widgets:
-            w.setParent(None)
-        self.current_widgets = []
-        while self.form_layout.rowCount() > 0:
-            self.form_layout.removeRow(0)
+        self._current_option = None
+        self._current_row = None
+        self._form_dirty = False
+        self.form_widget.setVisible(False)
+
+    def _mark_form_dirty(self, *_):
+        self._form_dirty = True
 
     def on_select_option(self, current, previous=None):
-        if current is None:
+        self._pending_index = QPersistentModelIndex(current)
+        self._sel_timer.start()
+
+    def _apply_selection(self):
+        current = self._pending_index
+        if not current.isValid():
             return
         
-        option = current.option
-        self.clear_form()
-        
-        key_label = QLabel('Option:')
-        key_edit = QLineEdit(option.key)
-        self.form_layout.addRow(key_label, key_edit)
+        self._commit_edits()
         
-        value_label = QLabel('Value:')
-        value_edit = QLineEdit(option.value if option.value else '')
-        self.form_layout.addRow(value_label, value_edit)
+        row = current.row()
+        option = self.sshd.all_lines[row]
+        self._current_row = row
+        self._current_option = option
         
-        comment_chk = QCheckBox('Commented out (disabled)')
-        comment_chk.setChecked(option.commented)
-        self.form_layout.addRow(QLabel(''), comment_chk)
+        self.key_edit.setText(option.key)
+        self.value_edit.setText(option.value if option.value else '')
+        self.comment_chk.setChecked(option.commented)
         
-        if option.key in self.expl:
-            expl_label = QLabel('Description:')
-            expl_text = QTextEdit()
-            expl_text.setPlainText(self.expl[option.key])
-            expl_text.setMaximumHeight(80)
-            expl_text.setReadOnly(True)
-            self.form_layout.addRow(expl_label, expl_text)
-            self.current_widgets.extend([expl_label, expl_text])
+        expl = self._get_expl(option.key)
+        self.expl_text.setPlainText(expl)
+        self.form_layout.setRowVisible(self.expl_text, bool(expl))
+        self.form_widget.setVisible(True)
+        self._form_dirty = False
+
+    def _commit_edits(self):
+        """Write the editor values back into the option shown in the form."""
+        option = self._current_option
+        if option is None or not self._form_dirty:
+            return
+        self._form_dirty = False
         
-        delete_btn = QPushButton('Delete This Option')
-        delete_btn.setStyleSheet("background-color: #cc0000; color: white;")
-        delete_btn.clicked.connect(lambda: self.delete_option(current.index))
-        self.form_layout.addRow(delete_btn)
+        new_key = self.key_edit.text().strip()
+        new_value = self.value_edit.text().strip()
+        new_commented = self.comment_chk.isChecked()
         
-        self.current_widgets.extend([key_label, key_edit, value_label, value_edit, comment_chk, delete_btn])
+        if (new_key == option.key and new_value == (option.value or '')
+                and new_commented == option.commented):
+            return
         
-        current.editor_refs = {
-            'key': key_edit,
-            'value': value_edit,
-            'commented': comment_chk
-        }
+        self.sshd.update_option(option, new_key, new_value, new_commented)
+        self.model.refresh_row(self._current_row)
 
     def delete_option(self, index):
         reply = QMessageBox.question(self, 'Delete Option', 
                                    'Are you sure you want to delete this option?',
                                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No)
         if reply == QMessageBox.StandardButton.Yes:
-            del self.sshd.all_lines[index]
-            self.reload_options_list()
             self.clear_form()
+            self.model.removeRows(index, 1)
 
     def on_add_option(self):
-        key, ok = QInputDialog.getText(self, 'Add Option', 'Enter option name:')
-        if ok and key.strip():
-            value, ok2 = QInputDialog.getText(self, 'Add Option', 'Enter option value (optional):')
-            if ok2:
-                self.sshd.add_option(key.strip(), value.strip())
-                self.reload_options_list()
+        self._add_key_edit.clear()
+        self._add_value_edit.clear()
+        self._add_key_edit.setFocus()
+        if self._add_opt_dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+        key = self._add_key_edit.text().strip()
+        if key:
+            self.model.add_option(key, self._add_value_edit.text().strip())
 
     def on_backup(self):
         try:
@@ -313,8 +384,7 @@ class SSHDMainWindow(QMainWindow):
         try:
             text = self.collect_and_serialize()
             bakpath = self.sshd.path + '.bak'
-            with open(bakpath, 'w', encoding='utf-8') as f:
-                f.write(text)
+            utils.write_file_atomic(bakpath, text)
             QMessageBox.information(self, 'Saved', f'Saved to {bakpath}')
         except Exception as e:
             QMessageBox.critical(self, 'Error', str(e))
@@ -329,41 +399,39 @@ class SSHDMainWindow(QMainWindow):
             QMessageBox.critical(self, 'Error', f'Failed to refresh configuration: {str(e)}')
 
     def on_save(self):
+        # Serializing reads the editors, so it stays on the UI thread; only the disk
+        # writes go to the pool
         try:
-            self.sshd.write_backup()
-            
             text = self.collect_and_serialize()
-            with open(self.sshd.path, 'w', encoding='utf-8') as f:
-                f.write(text)
-            
-            self.refresh_configuration()
-            
-            QMessageBox.information(self, 'Saved', 
-                                  'Configuration saved and backup created.\n\n'
-                                  'To apply changes, restart SSH service:\n'
-                                  'sudo systemctl restart ssh')
         except Exception as e:
             QMessageBox.critical(self, 'Error', str(e))
+            return
+
+        # The text is already serialized, so nothing may be edited until the save lands
+        self.set_controls_enabled(False)
+        self.statusBar().showMessage('Saving configuration...')
+        self._save_task = SaveTask(self.sshd, text)
+        self._save_task.signals.finished.connect(self.on_saved)
+        self._save_task.signals.error.connect(self.on_save_failed)
+        QThreadPool.globalInstance().start(self._save_task)
+
+    def on_saved(self, bak):
+        self._save_task = None
+        self.statusBar().clearMessage()
+        # The file now holds exactly to_text(), so the list and the open form are
+        # already current; only a reload from disk needs refresh_configuration
+        self.set_controls_enabled(True)
+        QMessageBox.information(self, 'Saved', 
+                              'Configuration saved and backup created.\n\n'
+                              'To apply changes, restart SSH service:\n'
+                              'sudo systemctl restart ssh')
+
+    def on_save_failed(self, error):
+        self._save_task = None
+        self.statusBar().clearMessage()
+        self.set_controls_enabled(True)
+        QMessageBox.critical(self, 'Error', error)
 
     def collect_and_serialize(self) -> str:
-        for i in range(self.list_widget.count()):
-            item = self.list_widget.item(i)
-            if hasattr(item, 'editor_refs'):
-                option = item.option
-                refs = item.editor_refs
-                
-                new_key = refs['key'].text().strip()
-                new_value = refs['value'].text().strip()
-                new_commented = refs['commented'].isChecked()
-                
-                option.key = new_key
-                option.value = new_value
-                option.commented = new_commented
-                
-                if new_key:
-                    raw = f'{new_key} {new_value}' if new_value else new_key
-                    if new_commented:
-                        raw = f'#{raw}'
-                    option.raw = raw
-        
-        return self.sshd.to_text()
\ No newline at end of file
+        self._commit_edits()
+        return self.sshd.to_text()
@@ -3,10 +3,13 @@ Parser and serializer for OpenSSH server config (sshd_config) that preserves com
 This handles the server configuration format which is different from client config.
 """
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
-import re
+from typing import List, Optional, Dict, Iterable
 import os
+import sys
 import shutil
+import mmap
+from collections import defaultdict, deque
+import utils
 
 @dataclass
 class SSHDOption:
@@ -15,6 +18,20 @@ class SSHDOption:
     raw: str
     commented: bool = False
     line_number: int = 0
+    _display: Optional[str] = field(default=None, compare=False, repr=False)
+
+    @property
+    def display(self) -> str:
+        """Title shown in the option list; cached until _display is reset on edit."""
+        if self._display is None:
+            if self.key and self.value:
+                title = self.key + ': ' + self.value
+            elif self.key:
+                title = self.key
+            else:
+                title = '<comment>'
+            self._display = '# ' + title if self.commented else title
+        return self._display
 
 @dataclass
 class SSHDInclude:
@@ -29,6 +46,13 @@ class SSHDConfig:
         self.includes: List[SSHDInclude] = []
         self.comments: List[SSHDOption] = []  
         self.all_lines: List[SSHDOption] = []  
+        self.loaded = False
+        # Serialized text from the last to_text(); reset whenever all_lines changes
+        self._serialized_cache: Optional[str] = None
+        # all_lines entries by lowercased key, kept in sync by load and the edit methods
+        self._by_key: Dict[str, List[SSHDOption]] = defaultdict(list)
+        # Paths known to exist; see _exists()
+        self._existing_paths: set = set()
         
         self.ignored_comment_blocks = [
             [
@@ -74,129 +98,242 @@ class SSHDConfig:
             ["# override default of no subsystems"],
             ["# Example of overriding settings on a per-user basis"]
         ]
+
+        # Candidate blocks keyed by their first line, so a line only gets compared
+        # against blocks that can actually start there
+        self._blocks_by_first: Dict[str, List[tuple]] = {}
+        for block in self.ignored_comment_blocks:
+            stripped_block = tuple(line.strip() for line in block)
+            self._blocks_by_first.setdefault(stripped_block[0], []).append(stripped_block)
     
-    def _is_ignored_comment_block(self, lines, start_index):
+    def _is_ignored_comment_block(self, stripped_lines, start_index):
         """Check if the current position starts any of the ignored comment blocks"""
-        for ignored_block in self.ignored_comment_blocks:
-            if start_index + len(ignored_block) > len(lines):
+        candidates = self._blocks_by_first.get(stripped_lines[start_index])
+        if not candidates:
+            return 0
+
+        for ignored_block in candidates:
+            if start_index + len(ignored_block) > len(stripped_lines):
                 continue
-                
-            block_matches = True
-            for i, expected_line in enumerate(ignored_block):
-                if start_index + i >= len(lines):
-                    block_matches = False
-                    break
-                actual_line = lines[start_index + i].strip()
-                if actual_line != expected_line:
-                    block_matches = False
+            for i in range(1, len(ignored_block)):
+                if stripped_lines[start_index + i] != ignored_block[i]:
                     break
-            
-            if block_matches:
-                return len(ignored_block)  
+            else:
+                return len(ignored_block)
         
         return 0  
 
+    def _exists(self, path) -> bool:
+        """os.path.exists, remembering positive answers to save repeated stat calls.
+
+        A hit can be stale if the file is deleted behind our back; callers that then
+        fail to open it must discard the path and report it as missing.
+        """
+        if path in self._existing_paths:
+            return True
+        if os.path.exists(path):
+            self._existing_paths.add(path)
+            return True
+        return False
+
+    def _read_lines(self):
+        """Yield the config's lines one at a time, decoded from a read-only mmap."""
+        with open(self.path, 'rb') as f:
+            # mmap refuses empty files
+            if not os.fstat(f.fileno()).st_size:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for raw in iter(mm.readline, b''):
+                    yield raw.decode('utf-8')
+
     def load(self):
-        if not os.path.exists(self.path):
-            raise FileNotFoundError(f'SSH server config not found: {self.path}')
-
-        with open(self.path, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-
-        self.options = []
-        self.includes = []
-        self.comments = []
-        self.all_lines = []
-
-        i = 0
-        while i < len(lines):
-            raw_line = lines[i]
-            line = raw_line.rstrip('\n')
-            stripped = line.strip()
-            line_num = i + 1
-
-            block_length = self._is_ignored_comment_block(lines, i)
-            if stripped.startswith('#') and block_length > 0:
-                i += block_length
-                continue
+        if self._exists(self.path):
+            try:
+                self._parse_lines(self._read_lines())
+                return
+            except FileNotFoundError:
+                self._existing_paths.discard(self.path)
+        raise FileNotFoundError(f'SSH server config not found: {self.path}')
+
+    def _parse_lines(self, lines: Iterable[str]):
+        """Parse config lines (with or without line endings) and replace the current state."""
+        options: List[SSHDOption] = []
+        includes: List[SSHDInclude] = []
+        comments: List[SSHDOption] = []
+        all_lines: List[SSHDOption] = []
+
+        # Stream the file, buffering only as many lines as the longest ignored block
+        lookahead = max(len(block) for blocks in self._blocks_by_first.values() for block in blocks)
+        source = iter(lines)
+        raw_window = deque()
+        stripped_window = deque()
+        line_num = 0
+
+        while True:
+            while len(raw_window) < lookahead:
+                raw_line = next(source, None)
+                if raw_line is None:
+                    break
+                raw_window.append(raw_line)
+                stripped_window.append(raw_line.strip())
+            if not raw_window:
+                break
+
+            stripped = stripped_window[0]
+            if stripped.startswith('#'):
+                block_length = self._is_ignored_comment_block(stripped_window, 0)
+                if block_length > 0:
+                    for _ in range(block_length):
+                        raw_window.popleft()
+                        stripped_window.popleft()
+                    line_num += block_length
+                    continue
+
+            line = raw_window.popleft().rstrip('\r\n')
+            stripped_window.popleft()
+            line_num += 1
 
             # Ignore empty lines
             if not stripped:
-                i += 1
                 continue
 
             # Handle comment lines
             if stripped.startswith('#'):
                 uncommented = stripped.lstrip('#').strip()
-                opt_match = re.match(r'^(\S+)(\s+(.*))?$', uncommented)
-                if opt_match and uncommented:
-                    key = opt_match.group(1)
-                    value = opt_match.group(3) if opt_match.group(3) else ''
+                if uncommented:
+                    parts = uncommented.split(None, 1)
+                    key = sys.intern(parts[0])
+                    value = parts[1] if len(parts) > 1 else ''
                     option = SSHDOption(key=key, value=value, raw=line, commented=True, line_number=line_num)
-                    self.all_lines.append(option)
-                    i += 1
+                    all_lines.append(option)
                     continue
 
                 comment = SSHDOption(key='', value=None, raw=line, commented=True, line_number=line_num)
-                self.comments.append(comment)
-                self.all_lines.append(comment)
-                i += 1
+                comments.append(comment)
+                all_lines.append(comment)
                 continue
 
-            include_match = re.match(r'^Include\s+(.+)$', stripped, re.IGNORECASE)
-            if include_match:
-                include_path = include_match.group(1)
+            # "Key value..." split on the first whitespace run
+            parts = stripped.split(None, 1)
+            key = parts[0]
+            value = parts[1] if len(parts) > 1 else ''
+
+            if value and key.lower() == 'include':
+                include_path = value
                 include = SSHDInclude(path=include_path, raw=line, line_number=line_num)
-                self.includes.append(include)
+                includes.append(include)
                 option = SSHDOption(key='Include', value=include_path, raw=line, commented=False, line_number=line_num)
-                self.options.append(option)
-                self.all_lines.append(option)
-                i += 1
+                options.append(option)
+                all_lines.append(option)
                 continue
 
-            opt_match = re.match(r'^(\S+)(\s+(.*))?$', stripped)
-            if opt_match:
-                key = opt_match.group(1)
-                value = opt_match.group(3) if opt_match.group(3) else ''
-                option = SSHDOption(key=key, value=value, raw=line, commented=False, line_number=line_num)
-                self.options.append(option)
-                self.all_lines.append(option)
-            else:
-                comment = SSHDOption(key='', value=None, raw=line, commented=True, line_number=line_num)
-                self.comments.append(comment)
-                self.all_lines.append(comment)
+            option = SSHDOption(key=sys.intern(key), value=value, raw=line, commented=False, line_number=line_num)
+            options.append(option)
+            all_lines.append(option)
 
-            i += 1
+        # Only replace the previous state once the whole file has parsed
+        self.options = options
+        self.includes = includes
+        self.comments = comments
+        self.all_lines = all_lines
+        self._serialized_cache = None
+        self._by_key = defaultdict(list)
+        for option in all_lines:
+            self._by_key[option.key.lower()].append(option)
+        self.loaded = True
 
     def to_text(self) -> str:
-        parts = []
-        for option in self.all_lines:
-            if option.commented and option.key:
-                if not option.raw.strip().startswith('#'):
-                    parts.append(f'#{option.raw}')
-                else:
-                    parts.append(option.raw)
-            else:
-                parts.append(option.raw)
-        return '\n'.join(parts) + '\n'
+        """Serialize all_lines, reusing the previous result if nothing changed since.
+
+        Edits must go through add_option/update_option/remove_option so the cache is reset.
+        """
+        if self._serialized_cache is None:
+            self._serialized_cache = '\n'.join(
+                f'#{option.raw}' if option.commented and option.key and not option.raw.lstrip().startswith('#')
+                else option.raw
+                for option in self.all_lines
+            ) + '\n'
+        return self._serialized_cache
 
     def write_backup(self, bak_path=None):
         bak = bak_path or self.path + '.bak'
         shutil.copy2(self.path, bak)
+        self._existing_paths.add(bak)
+        return bak
+
+    def ensure_backup_exists(self):
+        bak = utils.ensure_backup_exists(self.path, exists=self._exists)
+        self._existing_paths.add(bak)
+        return bak
+
+    def save(self, text: str, bak_path=None):
+        """Atomically replace the config with text, keeping the old file as the backup.
+
+        The current file is hard-linked to the backup path rather than copied. The new
+        backup is staged next to the old one and swapped in with os.replace() only after
+        the new contents are fsynced, so a failed save leaves both the config and the
+        previous backup untouched.
+        """
+        bak = bak_path or self.path + '.bak'
+
+        def link_backup():
+            staged = bak + '.new'
+            try:
+                os.unlink(staged)
+            except FileNotFoundError:
+                pass
+            try:
+                try:
+                    os.link(self.path, staged)
+                except OSError:
+                    # Filesystem without hard links
+                    shutil.copy2(self.path, staged)
+                os.replace(staged, bak)
+            except BaseException:
+                try:
+                    os.unlink(staged)
+                except FileNotFoundError:
+                    pass
+                raise
+
+        try:
+            utils.write_file_atomic(self.path, text, before_replace=link_backup)
+        except BaseException:
+            self._existing_paths.difference_update((self.path, bak))
+            raise
+        self._existing_paths.update((self.path, bak))
         return bak
 
     def restore_backup(self, bak_path=None):
         bak = bak_path or self.path + '.bak'
-        if not os.path.exists(bak):
+        if not self._exists(bak):
             raise FileNotFoundError('Backup not found')
-        shutil.copy2(bak, self.path)
+        try:
+            shutil.copy2(bak, self.path)
+        except FileNotFoundError:
+            if os.path.exists(bak):
+                raise
+            self._existing_paths.discard(bak)
+            raise FileNotFoundError('Backup not found') from None
+        self._existing_paths.add(self.path)
 
     def get_options_by_key(self, key: str) -> List[SSHDOption]:
-        """Get all options with a specific key (case-insensitive)"""
-        return [opt for opt in self.all_lines if opt.key.lower() == key.lower()]
+        """Get all options with a specific key (case-insensitive)
+
+        Options appear in file order, except that ones renamed since load come last.
+        """
+        return list(self._by_key.get(key.lower(), ()))
+
+    def _unindex(self, option: SSHDOption):
+        bucket = self._by_key[option.key.lower()]
+        for i, indexed in enumerate(bucket):
+            if indexed is option:
+                del bucket[i]
+                break
 
     def add_option(self, key: str, value: str, commented: bool = False):
         """Add a new option"""
+        key = sys.intern(key)
         raw = f'{key} {value}' if value else key
         if commented:
             raw = f'#{raw}'
@@ -204,4 +341,30 @@ class SSHDConfig:
         self.all_lines.append(option)
         if not commented:
             self.options.append(option)
-        return option
\ No newline at end of file
+        self._by_key[key.lower()].append(option)
+        self._serialized_cache = None
+        return option
+
+    def update_option(self, option: SSHDOption, key: str, value: str, commented: bool):
+        """Apply an edit to an existing option and rebuild its raw line"""
+        key = sys.intern(key)
+        if key.lower() != option.key.lower():
+            self._unindex(option)
+            self._by_key[key.lower()].append(option)
+        option.key = key
+        option.value = value
+        option.commented = commented
+        option._display = None
+        if key:
+            raw = f'{key} {value}' if value else key
+            if commented:
+                raw = f'#{raw}'
+            option.raw = raw
+        self._serialized_cache = None
+
+    def remove_option(self, index: int, count: int = 1):
+        """Remove count lines starting at index from all_lines"""
+        for option in self.all_lines[index:index + count]:
+            self._unindex(option)
+        del self.all_lines[index:index + count]
+        self._serialized_cache = None
\ No newline at end of file
@@ -1,5 +1,6 @@
 import os
 import sys
+import stat
 import shutil
 from pathlib import Path
 
@@ -13,8 +14,40 @@ def require_root_or_exit():
     except AttributeError:
         return
 
-def ensure_backup_exists(config_path):
+def ensure_backup_exists(config_path, exists=os.path.exists):
     bak = config_path + '.bak'
-    if not os.path.exists(bak):
+    if not exists(bak):
         shutil.copy2(config_path, bak)
-    return bak
\ No newline at end of file
+    return bak
+
+def write_file_atomic(path, text, before_replace=None):
+    """Replace path with text via an fsynced temp file and os.replace().
+
+    The data is written with os.write on the raw fd, so there is no text-mode
+    buffering layer. An existing file keeps its permission bits; a new one gets
+    the same default mode open(path, 'w') would give it. before_replace, if given,
+    is called once the temp file is safely on disk and just before path is replaced.
+    """
+    tmp = path + '.tmp'
+    data = memoryview(text.encode('utf-8'))
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        try:
+            try:
+                os.fchmod(fd, stat.S_IMODE(os.stat(path).st_mode))
+            except FileNotFoundError:
+                pass
+            while data:
+                data = data[os.write(fd, data):]
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        if before_replace is not None:
+            before_replace()
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise